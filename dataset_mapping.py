@@ -1,9 +1,46 @@
 #!/usr/bin/env python3
+import os
+import numpy as np
 import pandas as pd
-import random
+import re
 import sys
 import argparse
-from math import floor
+import functools
+
+# Replace common terms for consistency
+_HOSPITAL_REPLACEMENTS = {
+    "Hôpital": "Hospital",
+    "Clinique": "Clinic",
+    "Health Center": "Health Centre",
+    "University Hospital": "University Hospital",
+    # Add more replacements as needed
+}
+
+# Longest terms first so that a term is never shadowed by one of its prefixes
+_HOSPITAL_TERMS = sorted(_HOSPITAL_REPLACEMENTS, key=len, reverse=True)
+
+# Regex fallback of the replacement pass, compiled once at import time
+_HOSPITAL_REPLACEMENTS_RE = re.compile('|'.join(re.escape(old) for old in _HOSPITAL_TERMS))
+
+# Number of distinct names from which polars' replace_many saves more than its import costs
+_POLARS_MIN_NAMES = 300000
+
+# Manual corrections (example), matched against whole names after the term replacements
+_MANUAL_REPLACEMENTS = {
+    "St Pierre Hospital": "St. Pierre Hospital",
+    "Central Health Center": "Central Health Centre",
+    # Add more manual corrections as needed
+}
+
+# Number of regions from which the allocation kernel is JIT-compiled with numba
+_NUMBA_MIN_REGIONS = 1000
+
+# pandas' default na_values, so that the polars engine and the chunked Hospital
+# column read the same cells as missing
+_CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
 
 def allocate_hospitals_proportional(regions, total_hospitals, seed=None):
     """
@@ -12,65 +49,189 @@ def allocate_hospitals_proportional(regions, total_hospitals, seed=None):
     Args:
         regions (dict): Dictionary with region names as keys and populations as values.
         total_hospitals (int): Total number of unique hospitals to allocate.
-        seed (int, optional): Random seed for reproducibility.
+        seed (int, optional): Unused, the allocation is deterministic; kept for compatibility.
 
     Returns:
         dict: Mapping of regions to the number of hospitals allocated.
     """
-    if seed is not None:
-        random.seed(seed)
+    names = list(regions.keys())
+    populations = np.fromiter(regions.values(), dtype=np.int64, count=len(names))
 
-    total_population = sum(regions.values())
-    allocation = {}
-    fractional_allocation = {}
+    # numba's import and compile cost more than they save on a handful of regions
+    if len(names) >= _NUMBA_MIN_REGIONS:
+        allocation = _jit_allocate_proportional()(populations, int(total_hospitals))
+    else:
+        allocation = _allocate_proportional(populations, int(total_hospitals))
+    return dict(zip(names, allocation.tolist()))
 
+def _allocate_proportional(populations, total_hospitals):
     # Initial allocation based on floor of proportional hospitals
-    for region, population in regions.items():
-        proportion = population / total_population
-        exact_allocation = proportion * total_hospitals
-        allocated = floor(exact_allocation)
-        allocation[region] = allocated
-        fractional_allocation[region] = exact_allocation - allocated
-
-    # Calculate remaining hospitals to allocate
-    allocated_total = sum(allocation.values())
-    remaining = total_hospitals - allocated_total
-
+    exact_allocation = populations / populations.sum() * total_hospitals
+    allocation = np.floor(exact_allocation).astype(np.int64)
+    fractional_allocation = exact_allocation - allocation
+
+    # Give the remaining hospitals to the regions with the highest fractional
+    # allocation: O(R) selection of the cut-off instead of a full sort, with
+    # ties at the cut-off going to the earliest regions (as a stable sort would)
+    remaining = total_hospitals - int(allocation.sum())
     if remaining > 0:
-        # Sort regions by highest fractional allocation
-        sorted_regions = sorted(fractional_allocation.items(), key=lambda x: x[1], reverse=True)
-        for region, frac in sorted_regions:
-            if remaining == 0:
-                break
-            allocation[region] += 1
-            remaining -= 1
-
+        cutoff = -np.partition(-fractional_allocation, remaining - 1)[remaining - 1]
+        above = np.flatnonzero(fractional_allocation > cutoff)
+        ties = np.flatnonzero(fractional_allocation == cutoff)[:remaining - above.size]
+        allocation[above] += 1
+        allocation[ties] += 1
     return allocation
 
+@functools.lru_cache(maxsize=None)
+def _jit_allocate_proportional():
+    # numba is optional and only imported for large region tables; without it
+    # the plain numpy kernel is used
+    try:
+        from numba import njit
+    except ImportError:
+        return _allocate_proportional
+    return njit(cache=True)(_allocate_proportional)
+
 def assign_hospitals_to_regions(hospitals, allocation, seed=None):
     """
     Assigns hospitals to regions based on the allocation.
 
     Args:
-        hospitals (list): List of unique hospital names.
+        hospitals (array-like): Unique hospital names (not modified).
         allocation (dict): Mapping of regions to the number of hospitals to assign.
         seed (int, optional): Random seed for reproducibility.
 
     Returns:
         dict: Mapping of hospital names to their assigned regions.
     """
-    if seed is not None:
-        random.seed(seed)
+    # Shuffle in C on a private generator, leaving the global random state untouched
+    rng = np.random.default_rng(seed)
+    hospitals = rng.permutation(np.asarray(hospitals, dtype=object))
+
+    # Region of each shuffled slot: every region repeated by its allocated count
+    regions = np.repeat(
+        np.array(list(allocation.keys()), dtype=object),
+        np.fromiter(allocation.values(), dtype=np.int64, count=len(allocation))
+    )
+    return dict(zip(hospitals, regions.tolist()))
 
-    random.shuffle(hospitals)
-    mapping = {}
-    current_index = 0
-    for region, count in allocation.items():
-        assigned_hospitals = hospitals[current_index:current_index + count]
-        for hospital in assigned_hospitals:
-            mapping[hospital] = region
-        current_index += count
-    return mapping
+def build_region_mapping(hospitals, regions, seed=None):
+    """
+    Allocates the unique hospitals to regions by population and assigns them.
+    Exits with an error message if the allocation fails.
+
+    Args:
+        hospitals (array-like): Unique cleaned hospital names.
+        regions (dict): Dictionary with region names as keys and populations as values.
+        seed (int, optional): Random seed for reproducibility.
+
+    Returns:
+        tuple: Mapping of regions to their number of hospitals, and mapping of
+            hospital names to their assigned regions.
+    """
+    try:
+        allocation = allocate_hospitals_proportional(
+            regions=regions,
+            total_hospitals=len(hospitals),
+            seed=seed
+        )
+    except ValueError as ve:
+        print(f"Allocation Error: {ve}")
+        sys.exit(1)
+    mapping = assign_hospitals_to_regions(
+        hospitals=hospitals,
+        allocation=allocation,
+        seed=seed
+    )
+    return allocation, mapping
+
+def map_hospitals_to_regions(hospitals, mapping, regions, default=None):
+    """
+    Maps a categorical hospital column to regions at the category-code level.
+
+    Args:
+        hospitals (Series): Categorical Series of hospital names.
+        mapping (dict): Mapping of hospital names to their assigned regions.
+        regions (list): Region names, used as the categories of the result.
+        default (str, optional): Region (one of `regions`) given to missing or
+            unmapped hospitals; left missing if not set.
+
+    Returns:
+        Categorical: Region per row.
+    """
+    region_index = pd.Index(regions)
+    # One lookup per distinct hospital, then a gather over the row codes
+    region_per_hospital = region_index.get_indexer(
+        [mapping.get(hospital, default) for hospital in hospitals.cat.categories]
+    )
+    # Trailing sentinel for missing hospitals (code -1)
+    default_code = region_index.get_loc(default) if default is not None else -1
+    region_per_hospital = np.append(region_per_hospital, default_code)
+    region_codes = region_per_hospital[hospitals.cat.codes.to_numpy()]
+    return pd.Categorical.from_codes(region_codes, categories=region_index)
+
+def reduce_mem_usage(df, category_ratio=0.5):
+    """
+    Downcasts numeric columns to their smallest lossless subtype and converts
+    low-cardinality string columns to categoricals.
+
+    Args:
+        df (DataFrame): Pandas DataFrame to shrink.
+        category_ratio (float, optional): Maximum ratio of unique values to rows
+            for a string column to be converted to a categorical.
+
+    Returns:
+        DataFrame: The same DataFrame with downcast columns.
+    """
+    for column in df.columns:
+        col = df[column]
+        if pd.api.types.is_integer_dtype(col):
+            df[column] = pd.to_numeric(col, downcast='integer')
+        elif pd.api.types.is_float_dtype(col):
+            downcast = pd.to_numeric(col, downcast='float')
+            # float32 drops digits: only keep it when every value round-trips
+            if downcast.dtype != col.dtype and downcast.astype(col.dtype).equals(col):
+                df[column] = downcast
+        elif pd.api.types.is_string_dtype(col) or pd.api.types.is_object_dtype(col):
+            if len(col) and col.nunique() / len(col) < category_ratio:
+                df[column] = col.astype('category')
+    return df
+
+@functools.lru_cache(maxsize=None)
+def _import_polars():
+    # polars is optional: needed for --engine polars, and otherwise only imported
+    # to speed up the term replacements on large name sets
+    try:
+        import polars
+    except ImportError:
+        return None
+    return polars
+
+def replace_hospital_terms(names):
+    """
+    Applies all hospital term replacements to a Series of names in one pass.
+
+    Uses Polars' Aho-Corasick based replace_many on large name sets when Polars
+    is installed, and the compiled alternation regex otherwise; both pick the
+    leftmost, then longest, matching term.
+
+    Args:
+        names (Series): Pandas Series of Arrow-backed hospital names.
+
+    Returns:
+        Series: Series of names with the replacements applied.
+    """
+    # polars' import costs more than replace_many saves on smaller name sets
+    pl = _import_polars() if len(names) >= _POLARS_MIN_NAMES else None
+    if pl is None:
+        return names.str.replace(
+            _HOSPITAL_REPLACEMENTS_RE, lambda match: _HOSPITAL_REPLACEMENTS[match.group(0)], regex=True
+        )
+    replaced = pl.from_pandas(names).str.replace_many(
+        _HOSPITAL_TERMS, [_HOSPITAL_REPLACEMENTS[old] for old in _HOSPITAL_TERMS], leftmost=True
+    )
+    # Positional: the result takes the input's index as is, whatever its labels
+    return pd.Series(replaced.to_arrow(), index=names.index, dtype='string[pyarrow]')
 
 def standardize_hospital_names(df):
     """
@@ -80,34 +241,219 @@ def standardize_hospital_names(df):
         df (DataFrame): Pandas DataFrame containing the 'Hospital' column.
 
     Returns:
-        DataFrame: DataFrame with a new 'Hospital_cleaned' column.
+        DataFrame: DataFrame with a new categorical 'Hospital_cleaned' column, whose
+            categories are the distinct cleaned names in order of first appearance.
     """
+    # Clean each distinct raw name once; rows only carry integer codes into it
+    hospital_codes, hospitals = pd.factorize(df['Hospital'])
+
     # Remove leading/trailing spaces and standardize case
-    df['Hospital_cleaned'] = df['Hospital'].astype(str).str.strip().str.title()
-
-    # Replace common terms for consistency
-    replacements = {
-        "Hôpital": "Hospital",
-        "Clinique": "Clinic",
-        "Health Center": "Health Centre",
-        "University Hospital": "University Hospital",
-        # Add more replacements as needed
-    }
+    # (Arrow-backed strings keep the .str.* chain in vectorized pyarrow kernels)
+    cleaned = pd.Series(hospitals).astype('string[pyarrow]').str.strip().str.title()
 
-    for old, new in replacements.items():
-        df['Hospital_cleaned'] = df['Hospital_cleaned'].str.replace(old, new, regex=False)
+    # Replace common terms in a single pass over the names
+    cleaned = replace_hospital_terms(cleaned)
 
-    # Manual corrections (example)
-    manual_replacements = {
-        "St Pierre Hospital": "St. Pierre Hospital",
-        "Central Health Center": "Central Health Centre",
-        # Add more manual corrections as needed
-    }
+    # Manual corrections
+    cleaned = cleaned.replace(_MANUAL_REPLACEMENTS)
 
-    df['Hospital_cleaned'] = df['Hospital_cleaned'].replace(manual_replacements)
+    # Raw variants may clean to the same name: pool them into one category each,
+    # with a trailing -1 sentinel so that missing hospitals (code -1) stay missing
+    cleaned_codes, cleaned_names = pd.factorize(cleaned)
+    cleaned_codes = np.append(cleaned_codes, -1)
+    df['Hospital_cleaned'] = pd.Categorical.from_codes(
+        cleaned_codes[hospital_codes], categories=cleaned_names
+    )
 
     return df
 
+def map_regions_polars(input_file, output_file, regions, seed=None):
+    """
+    Runs the whole mapping pipeline on Polars' lazy engine, streaming the
+    dataset from the input CSV to the output file in chunks.
+
+    Args:
+        input_file (str): Path to the input CSV file.
+        output_file (str): Path for the output file (.csv, .csv.gz or .parquet).
+        regions (dict): Dictionary with region names as keys and populations as values.
+        seed (int, optional): Random seed for reproducibility.
+    """
+    pl = _import_polars()
+    if pl is None:
+        print("Error: The polars engine requires the 'polars' package to be installed.")
+        sys.exit(1)
+
+    to_parquet = output_file.endswith('.parquet')
+    if not to_parquet and output_file.endswith(('.bz2', '.xz', '.zst', '.zip', '.tar')):
+        print("Error: The polars engine only writes .csv, .csv.gz or .parquet files.")
+        sys.exit(1)
+
+    if to_parquet:
+        # Types are inferred from the whole file, so that a late non-numeric value
+        # does not fail the write; dates are stored as date32 like the pandas engine does
+        lf = pl.scan_csv(
+            input_file, null_values=_CSV_NA_VALUES, infer_schema_length=None, try_parse_dates=True
+        )
+    else:
+        # CSV output reads every column as text and passes it through verbatim
+        lf = pl.scan_csv(input_file, null_values=_CSV_NA_VALUES, infer_schema=False)
+
+    try:
+        # polars reports an empty file as a parse error
+        if os.path.getsize(input_file) == 0:
+            print(f"Error: The file '{input_file}' is empty.")
+            sys.exit(1)
+        schema = lf.collect_schema()
+        columns = schema.names()
+        if 'Hospital' not in columns:
+            print("Error: Required column 'Hospital' is missing from the dataset.")
+            sys.exit(1)
+
+        # Same cleanup as standardize_hospital_names, expressed lazily
+        lf = lf.with_columns(
+            pl.col('Hospital').cast(pl.Utf8).str.strip_chars().str.to_titlecase()
+            .str.replace_many(
+                _HOSPITAL_TERMS, [_HOSPITAL_REPLACEMENTS[old] for old in _HOSPITAL_TERMS], leftmost=True
+            )
+            .replace(_MANUAL_REPLACEMENTS)
+            .alias('Hospital_cleaned')
+        )
+
+        # Only the distinct cleaned names are materialized to build the mapping
+        unique_hospitals = (
+            lf.select(pl.col('Hospital_cleaned').drop_nulls().unique(maintain_order=True))
+            .collect(engine='streaming')
+            .to_series()
+            .to_numpy()
+        )
+
+        # Downcast integers like reduce_mem_usage, from one streaming min/max pass
+        # (only Parquet output has typed columns)
+        integer_columns = [name for name in columns if schema[name].is_integer()]
+        if integer_columns:
+            bounds = lf.select(
+                [pl.col(name).min().alias(f'{name}_min') for name in integer_columns]
+                + [pl.col(name).max().alias(f'{name}_max') for name in integer_columns]
+            ).collect(engine='streaming').row(0, named=True)
+            casts = []
+            for name in integer_columns:
+                low, high = bounds[f'{name}_min'], bounds[f'{name}_max']
+                if low is None:
+                    continue
+                for np_dtype, pl_dtype in ((np.int8, pl.Int8), (np.int16, pl.Int16), (np.int32, pl.Int32)):
+                    if np.iinfo(np_dtype).min <= low and high <= np.iinfo(np_dtype).max:
+                        casts.append(pl.col(name).cast(pl_dtype))
+                        break
+            if casts:
+                lf = lf.with_columns(casts)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file}' was not found.")
+        sys.exit(1)
+    except pl.exceptions.PolarsError:
+        print(f"Error: The file '{input_file}' could not be parsed.")
+        sys.exit(1)
+    print(f"Number of unique hospitals after cleaning: {len(unique_hospitals)}")
+
+    _, mapping = build_region_mapping(unique_hospitals, regions, seed=seed)
+
+    # Enum keeps Region 1-byte encoded, like the Categorical of the pandas path
+    lf = lf.with_columns(
+        pl.col('Hospital_cleaned')
+        .replace_strict(mapping, default='Unknown')
+        .cast(pl.Enum(list(regions.keys()) + ['Unknown']))
+        .alias('Region')
+    )
+
+    try:
+        if to_parquet:
+            lf.sink_parquet(output_file, compression='zstd')
+        elif output_file.endswith('.gz'):
+            lf.sink_csv(output_file, compression='gzip')
+        else:
+            lf.sink_csv(output_file)
+        print(f"Updated dataset saved to '{output_file}'.")
+    except pl.exceptions.ComputeError:
+        # Rows are only read in full here, so ragged lines first surface on write
+        print(f"Error: The file '{input_file}' could not be parsed.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: Could not save the updated dataset. {e}")
+        sys.exit(1)
+
+def map_regions_chunked(input_file, output_file, regions, chunksize, seed=None):
+    """
+    Runs the mapping pipeline on pandas one chunk of rows at a time, so that
+    memory use is bounded by the chunk size rather than the dataset size.
+    Columns other than 'Hospital' are passed through as text, so that the
+    output does not depend on where the chunk boundaries fall.
+
+    Args:
+        input_file (str): Path to the input CSV file.
+        output_file (str): Path for the output CSV file (.csv or .csv.gz).
+        regions (dict): Dictionary with region names as keys and populations as values.
+        chunksize (int): Number of rows read, processed and written at a time.
+        seed (int, optional): Random seed for reproducibility.
+    """
+    if output_file.endswith('.parquet'):
+        print("Error: Chunked processing writes CSV only; use --engine polars for streaming Parquet output.")
+        sys.exit(1)
+
+    # First pass over the Hospital column only, to build the mapping once
+    try:
+        columns = pd.read_csv(input_file, nrows=0).columns
+        if 'Hospital' not in columns:
+            print("Error: Required column 'Hospital' is missing from the dataset.")
+            sys.exit(1)
+        hospitals = pd.read_csv(input_file, engine='pyarrow', dtype=str, usecols=['Hospital'])
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file}' was not found.")
+        sys.exit(1)
+    except pd.errors.EmptyDataError:
+        print(f"Error: The file '{input_file}' is empty.")
+        sys.exit(1)
+    except pd.errors.ParserError:
+        print(f"Error: The file '{input_file}' could not be parsed.")
+        sys.exit(1)
+
+    hospitals = standardize_hospital_names(hospitals)
+    unique_hospitals = hospitals['Hospital_cleaned'].cat.categories.to_numpy()
+    del hospitals
+    print(f"Number of unique hospitals after cleaning: {len(unique_hospitals)}")
+
+    _, mapping = build_region_mapping(unique_hospitals, regions, seed=seed)
+
+    # Second pass: per chunk, only the string cleanup and the region lookup.
+    # Every column is read as text, since dtypes inferred per chunk would change
+    # how values are written; only Hospital reads the NA strings as missing.
+    try:
+        chunks = pd.read_csv(
+            input_file, chunksize=chunksize, dtype=str,
+            keep_default_na=False, na_values={'Hospital': _CSV_NA_VALUES}
+        )
+        for i, chunk in enumerate(chunks):
+            chunk = standardize_hospital_names(chunk)
+            chunk['Region'] = map_hospitals_to_regions(
+                chunk['Hospital_cleaned'],
+                mapping,
+                regions=list(regions.keys()) + ['Unknown'],
+                default='Unknown'
+            )
+            chunk.to_csv(output_file, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        print(f"Updated dataset saved to '{output_file}'.")
+    except pd.errors.ParserError:
+        # Chunks are parsed lazily, so a malformed row surfaces inside the loop
+        print(f"Error: The file '{input_file}' could not be parsed.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: Could not save the updated dataset. {e}")
+        sys.exit(1)
+
+def _positive_int(value):
+    # argparse type for --chunksize
+    if not value.isdigit() or int(value) == 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got '{value}'")
+    return int(value)
+
 def main():
     # -------------------------------
     # Configuration: Define Morocco's 12 Regions and their Populations
@@ -133,19 +479,36 @@ def main():
     # -------------------------------
     parser = argparse.ArgumentParser(description='Map hospitals to Moroccan regions based on population.')
     parser.add_argument('input_csv', type=str, help='Path to the input CSV file.')
-    parser.add_argument('-o', '--output', type=str, default='updated_dataset.csv', help='Path for the output CSV file.')
+    parser.add_argument('-o', '--output', type=str, default='updated_dataset.csv', help='Path for the output file (.csv, .csv.gz or .parquet).')
     parser.add_argument('-s', '--seed', type=int, default=42, help='Random seed for reproducibility.')
+    parser.add_argument('-e', '--engine', choices=['pandas', 'polars'], default='pandas',
+                        help='Processing engine; polars streams large inputs instead of loading them in memory.')
+    parser.add_argument('-c', '--chunksize', type=_positive_int, default=None,
+                        help='With the pandas engine, process the input this many rows at a time to bound memory; '
+                             'columns other than Hospital are then written as read.')
     args = parser.parse_args()
 
     input_file = args.input_csv
     output_file = args.output
     seed = args.seed
 
+    if args.engine == 'polars':
+        map_regions_polars(input_file, output_file, regions_population, seed=seed)
+        return
+    if args.chunksize:
+        map_regions_chunked(input_file, output_file, regions_population, args.chunksize, seed=seed)
+        return
+
     # -------------------------------
     # Step 1: Read the Dataset
     # -------------------------------
     try:
-        df = pd.read_csv(input_file)
+        # The pyarrow engine reports an empty file as a parse error
+        if os.path.getsize(input_file) == 0:
+            raise pd.errors.EmptyDataError(input_file)
+        # Multithreaded Arrow CSV reader; columns keep numpy-backed dtypes, which
+        # to_csv writes faster (Hospital is moved to Arrow strings for cleanup)
+        df = pd.read_csv(input_file, engine='pyarrow')
         print(f"Dataset '{input_file}' loaded successfully.")
     except FileNotFoundError:
         print(f"Error: The file '{input_file}' was not found.")
@@ -157,6 +520,8 @@ def main():
         print(f"Error: The file '{input_file}' could not be parsed.")
         sys.exit(1)
 
+    df = reduce_mem_usage(df)
+
     # -------------------------------
     # Step 2: Verify Required Columns Exist
     # -------------------------------
@@ -175,57 +540,50 @@ def main():
     # -------------------------------
     # Step 4: Extract Unique Hospitals After Cleaning
     # -------------------------------
-    unique_hospitals = df['Hospital_cleaned'].dropna().unique().tolist()
+    # The categories already are the distinct names in order of appearance
+    unique_hospitals = df['Hospital_cleaned'].cat.categories.to_numpy()
     num_hospitals = len(unique_hospitals)
     print(f"Number of unique hospitals after cleaning: {num_hospitals}")
 
     # -------------------------------
-    # Step 5: Allocate Hospitals to Regions Proportionally
-    # -------------------------------
-    try:
-        allocation = allocate_hospitals_proportional(
-            regions=regions_population,
-            total_hospitals=num_hospitals,
-            seed=seed
-        )
-        print("Hospital allocation per region based on population:")
-        for region, count in allocation.items():
-            print(f"  {region}: {count} hospitals")
-    except ValueError as ve:
-        print(f"Allocation Error: {ve}")
-        sys.exit(1)
-
-    # -------------------------------
-    # Step 6: Assign Hospitals to Regions
+    # Step 5: Allocate Hospitals to Regions Proportionally and Assign Them
     # -------------------------------
-    mapping = assign_hospitals_to_regions(
-        hospitals=unique_hospitals.copy(),
-        allocation=allocation,
-        seed=seed
-    )
+    allocation, mapping = build_region_mapping(unique_hospitals, regions_population, seed=seed)
+    print("Hospital allocation per region based on population:")
+    for region, count in allocation.items():
+        print(f"  {region}: {count} hospitals")
     print("Hospitals have been assigned to regions successfully.")
 
     # -------------------------------
-    # Step 7: Map Hospitals to Regions in Dataset
+    # Step 6: Map Hospitals to Regions in Dataset
     # -------------------------------
-    df['Region'] = df['Hospital_cleaned'].map(mapping)
+    df['Region'] = map_hospitals_to_regions(
+        df['Hospital_cleaned'],
+        mapping,
+        regions=list(regions_population.keys()) + ['Unknown'],
+        default='Unknown'
+    )
     print("Region column has been added to the dataset.")
 
     # -------------------------------
-    # Step 8: Verify Mapping Completeness
+    # Step 7: Verify Mapping Completeness
     # -------------------------------
-    missing_regions = df['Region'].isnull().sum()
+    # Unmapped hospitals were already given the 'Unknown' category in Step 6
+    missing_regions = (df['Region'] == 'Unknown').sum()
     if missing_regions > 0:
         print(f"Warning: {missing_regions} entries have hospitals that were not mapped to any region.")
-        # Assign 'Unknown' to these entries
-        df['Region'].fillna('Unknown', inplace=True)
         print("Assigned 'Unknown' to unmapped hospitals.")
 
     # -------------------------------
-    # Step 9: Save the Updated Dataset
+    # Step 8: Save the Updated Dataset
     # -------------------------------
     try:
-        df.to_csv(output_file, index=False)
+        if output_file.endswith('.parquet'):
+            # Columnar and compressed; categoricals are written as dictionary pages
+            df.to_parquet(output_file, compression='zstd', index=False)
+        else:
+            # Compression (e.g. .csv.gz) is inferred from the suffix
+            df.to_csv(output_file, index=False)
         print(f"Updated dataset saved to '{output_file}'.")
     except Exception as e:
         print(f"Error: Could not save the updated dataset. {e}")